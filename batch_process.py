@@ -2,8 +2,6 @@
 import os
 import glob
 from poker_parser import PokerLogParser
-import csv
-import re
 import json
 
 def create_mapping_cli(players, mapping_file):
@@ -115,35 +113,9 @@ def process_all_logs():
             parser_temp = PokerLogParser(log_file)
             print("收集玩家名单...")
             
-            # Read and sort rows by order (chronological)
-            rows = []
-            with open(log_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    rows.append(row)
-            
-            # Sort by order to get chronological sequence
-            rows.sort(key=lambda x: int(x['order']) if x['order'].isdigit() else 0)
-            
-            # Extract player names from entries in chronological order
-            for row in rows:
-                entry = row['entry']
-                # Extract player names from various patterns
-                patterns = [
-                    r'"([^"]+)" folds',
-                    r'"([^"]+)" calls',
-                    r'"([^"]+)" bets',
-                    r'"([^"]+)" raises',
-                    r'"([^"]+)" checks',
-                    r'"([^"]+)" posts',
-                    r'"([^"]+)" collected',
-                    r'dealer: "([^"]+)"',
-                    r'Player stacks:.*?"([^"]+)"'
-                ]
-                for pattern in patterns:
-                    matches = re.findall(pattern, entry)
-                    for match in matches:
-                        parser_temp.all_players.add(match)
+            # Load the log once; the rows are reused for the real parse below
+            rows = parser_temp.read_log_rows(log_file)
+            parser_temp.collect_players(rows)
             
             # Check for unmapped players and create CLI mapping
             log_name = os.path.basename(log_file)
@@ -165,7 +137,7 @@ def process_all_logs():
             # Parse with mappings
             parser = PokerLogParser(log_file)
             print(f"解析 {os.path.basename(log_file)}...")
-            parser.parse_log_file(log_file)
+            parser.parse_log_file(log_file, rows=rows)
             
             print(f"解析了 {len(parser.hands)} 手牌")
             
@@ -56,7 +56,14 @@ class LanguageManager:
             text = key
         
         # Format with parameters if provided
-        if kwargs and isinstance(text, str):
+        if kwargs:
+            text = self.format_text(text, **kwargs)
+        
+        return text
+    
+    def format_text(self, text, **kwargs):
+        """Format a localized template, falling back to the raw text on error"""
+        if isinstance(text, str):
             try:
                 text = text.format(**kwargs)
             except Exception as e:
@@ -104,4 +111,13 @@ def set_language(language):
 
 def get_text(key, **kwargs):
     """Convenience function to get localized text"""
-    return get_language_manager().get_text(key, **kwargs)
\ No newline at end of file
+    return get_language_manager().get_text(key, **kwargs)
+
+def get_formatter(key):
+    """Look up a localized template once and return a function that formats it
+    
+    For use in loops; formatting errors fall back to the raw text like get_text.
+    """
+    manager = get_language_manager()
+    text = manager.get_text(key)
+    return lambda **kwargs: manager.format_text(text, **kwargs)
\ No newline at end of file
@@ -3,10 +3,78 @@
 import os
 import glob
 import json
+import csv
+import queue
+import threading
+from operator import itemgetter
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from poker_parser import PlayerNameMapper
-from language_manager import get_text, set_language
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from poker_parser import PlayerNameMapper, PLAYER_NAME_RE
+from language_manager import get_text, get_formatter, set_language
+
+# log_file -> (st_mtime_ns, st_size, players)
+_PLAYERS_CACHE = {}
+
+def _collect_players(log_file):
+    """Collect all game usernames from a log file, cached per file version"""
+    st = os.stat(log_file)
+    cached = _PLAYERS_CACHE.get(log_file)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return set(cached[2])
+    
+    players = set()
+    with open(log_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            players.update(match.group(match.lastindex)
+                           for match in PLAYER_NAME_RE.finditer(row['entry']))
+    
+    _PLAYERS_CACHE[log_file] = (st.st_mtime_ns, st.st_size, frozenset(players))
+    return players
+
+# mapping_file -> (st_mtime_ns, st_size, mappings)
+_MAPPING_CACHE = {}
+
+def _load_mapping(mapping_file):
+    """Load a mapping file, reusing the parsed dict while the file is unchanged
+    
+    The returned dict is shared between callers and must not be modified.
+    """
+    st = os.stat(mapping_file)
+    cached = _MAPPING_CACHE.get(mapping_file)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    
+    with open(mapping_file, 'rb') as f:
+        raw = f.read()
+    mappings = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    _MAPPING_CACHE[mapping_file] = (st.st_mtime_ns, st.st_size, mappings)
+    return mappings
+
+def _write_mapping(mapping_file, mappings):
+    """Atomically write a mapping dict as indented UTF-8 JSON"""
+    if orjson is not None:
+        data = orjson.dumps(mappings, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(mappings, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    os.makedirs(os.path.dirname(mapping_file), exist_ok=True)
+    tmp_file = mapping_file + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, mapping_file)
+    except BaseException:
+        # Don't leave a partial temp file next to the real mapping
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    _MAPPING_CACHE.pop(mapping_file, None)
 
 def list_all_mappings():
     """List all existing player mappings with details"""
@@ -23,16 +91,20 @@ def list_all_mappings():
     print(get_text('mappings.found_files', count=len(mapping_files)))
     print("="*60)
     
+    # Resolve the per-file templates once instead of on every iteration
+    fmt_players_count = get_formatter('mappings.players_count')
+    fmt_file_path = get_formatter('mappings.file_path')
+    fmt_more = get_formatter('mappings.more_mappings')
+    
     for mapping_file in sorted(mapping_files):
         log_name = os.path.basename(mapping_file).replace('_mapping.json', '')
         print(f"\n📁 {log_name}")
         
         try:
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
+            mappings = _load_mapping(mapping_file)
             
-            print(get_text('mappings.players_count', count=len(mappings)))
-            print(get_text('mappings.file_path', path=mapping_file))
+            print(fmt_players_count(count=len(mappings)))
+            print(fmt_file_path(path=mapping_file))
             
             # Show first few mappings as preview
             items = list(mappings.items())
@@ -42,7 +114,7 @@ def list_all_mappings():
                 print(f"     {game_name[:30]}... -> {real_name}")
             
             if len(items) > preview_count:
-                print(get_text('mappings.more_mappings', count=len(items) - preview_count))
+                print(fmt_more(count=len(items) - preview_count))
                 
         except Exception as e:
             print(get_text('mappings.read_error', error=str(e)))
@@ -56,19 +128,32 @@ def show_mapping_details(log_name):
         return
     
     try:
-        with open(mapping_file, 'r', encoding='utf-8') as f:
-            mappings = json.load(f)
+        mappings = _load_mapping(mapping_file)
         
         print(f"详细映射 - {log_name}")
         print("="*60)
         print(f"总共 {len(mappings)} 个玩家映射:")
         
-        for game_name, real_name in sorted(mappings.items()):
-            print(f"  {game_name} -> {real_name}")
+        items = sorted(mappings.items(), key=itemgetter(0))
+        if items:
+            print("\n".join([f"  {game_name} -> {real_name}" for game_name, real_name in items]))
             
     except Exception as e:
         print(f"读取映射文件失败: {e}")
 
+def find_unmapped_log_files(log_files):
+    """Return the log files that don't have a mapping file yet"""
+    unmapped_files = []
+    for log_file in log_files:
+        log_name = os.path.basename(log_file)
+        if log_name.endswith('.csv'):
+            log_name = log_name[:-4]
+        mapping_file = f'player_mappings/{log_name}_mapping.json'
+        
+        if not os.path.exists(mapping_file):
+            unmapped_files.append(log_file)
+    return unmapped_files
+
 def create_all_mappings():
     """Create mappings for all log files that don't have mappings yet"""
     logs_dir = 'logs'
@@ -81,15 +166,7 @@ def create_all_mappings():
         print("No CSV log files found.")
         return
     
-    unmapped_files = []
-    for log_file in log_files:
-        log_name = os.path.basename(log_file)
-        if log_name.endswith('.csv'):
-            log_name = log_name[:-4]
-        mapping_file = f'player_mappings/{log_name}_mapping.json'
-        
-        if not os.path.exists(mapping_file):
-            unmapped_files.append(log_file)
+    unmapped_files = find_unmapped_log_files(log_files)
     
     if not unmapped_files:
         print("所有日志文件都已有映射！")
@@ -157,8 +234,7 @@ def create_all_mappings_cli():
         print(f"\n已映射的文件详情:")
         for log_file, mapping_file in mapped_files:
             try:
-                with open(mapping_file, 'r', encoding='utf-8') as f:
-                    mappings = json.load(f)
+                mappings = _load_mapping(mapping_file)
                 
                 # Check if mapping is complete
                 all_players, unmapped_players, _ = analyze_mapping_completeness(log_file, mapping_file)
@@ -224,38 +300,13 @@ def analyze_mapping_completeness(log_file, mapping_file):
         return None, None, None
     
     # Collect all players from log file
-    from poker_parser import PokerLogParser
-    import csv
-    import re
-    
-    all_players = set()
-    
-    with open(log_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            entry = row['entry']
-            patterns = [
-                r'"([^"]+)" folds',
-                r'"([^"]+)" calls',
-                r'"([^"]+)" bets',
-                r'"([^"]+)" raises',
-                r'"([^"]+)" checks',
-                r'"([^"]+)" posts',
-                r'"([^"]+)" collected',
-                r'dealer: "([^"]+)"',
-                r'Player stacks:.*?"([^"]+)"'
-            ]
-            for pattern in patterns:
-                matches = re.findall(pattern, entry)
-                for match in matches:
-                    all_players.add(match)
+    all_players = _collect_players(log_file)
     
     # Load existing mappings
     existing_mappings = {}
     if os.path.exists(mapping_file):
         try:
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                existing_mappings = json.load(f)
+            existing_mappings = _load_mapping(mapping_file)
         except Exception as e:
             print(f"Warning: Could not read mapping file {mapping_file}: {e}")
     
@@ -339,9 +390,7 @@ def supplement_mapping_cli(log_file, mapping_file):
     
     # Save updated mappings
     try:
-        os.makedirs(os.path.dirname(mapping_file), exist_ok=True)
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(new_mappings, f, ensure_ascii=False, indent=2)
+        _write_mapping(mapping_file, new_mappings)
         
         print(f"\n✅ 映射更新成功: {mapping_file}")
         print(f"新增映射: {added_count} 个")
@@ -440,8 +489,7 @@ def supplement_all_mappings_cli():
         
         # Show current progress
         try:
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                existing_mappings = json.load(f)
+            existing_mappings = _load_mapping(mapping_file)
             existing_count = len(existing_mappings)
         except:
             existing_count = 0
@@ -452,8 +500,7 @@ def supplement_all_mappings_cli():
             
             # Calculate how many were actually added
             try:
-                with open(mapping_file, 'r', encoding='utf-8') as f:
-                    updated_mappings = json.load(f)
+                updated_mappings = _load_mapping(mapping_file)
                 added = len(updated_mappings) - existing_count
                 total_added += added
             except:
@@ -469,8 +516,11 @@ def supplement_all_mappings_cli():
     print(f"📊 总计新增映射: {total_added} 个")
     print("="*70)
 
-def create_mapping_for_log(log_file, use_cli=False):
-    """Create a new mapping for a specific log file interactively"""
+def create_mapping_for_log(log_file, use_cli=False, players=None):
+    """Create a new mapping for a specific log file interactively
+    
+    ``players`` may be passed in when the caller has already scanned the log.
+    """
     if not os.path.exists(log_file):
         print(f"日志文件不存在: {log_file}")
         return False
@@ -479,31 +529,13 @@ def create_mapping_for_log(log_file, use_cli=False):
     
     # Create parser and collect player names
     from poker_parser import PokerLogParser
-    import csv
-    import re
     
     parser = PokerLogParser(log_file)
     
-    print("收集玩家名单...")
-    with open(log_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            entry = row['entry']
-            patterns = [
-                r'"([^"]+)" folds',
-                r'"([^"]+)" calls',
-                r'"([^"]+)" bets',
-                r'"([^"]+)" raises',
-                r'"([^"]+)" checks',
-                r'"([^"]+)" posts',
-                r'"([^"]+)" collected',
-                r'dealer: "([^"]+)"',
-                r'Player stacks:.*?"([^"]+)"'
-            ]
-            for pattern in patterns:
-                matches = re.findall(pattern, entry)
-                for match in matches:
-                    parser.all_players.add(match)
+    if players is None:
+        print("收集玩家名单...")
+        players = _collect_players(log_file)
+    parser.all_players.update(players)
     
     print(f"发现 {len(parser.all_players)} 个玩家")
     
@@ -560,9 +592,7 @@ def create_mapping_cli(players, mapping_file):
     
     # Save mappings
     try:
-        os.makedirs(os.path.dirname(mapping_file), exist_ok=True)
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(mappings, f, ensure_ascii=False, indent=2)
+        _write_mapping(mapping_file, mappings)
         
         print(f"\n✅ 映射保存成功: {mapping_file}")
         print(f"创建了 {len(mappings)} 个玩家映射")
@@ -595,6 +625,9 @@ def list_log_files():
     return log_files
 
 class MappingManagerGUI:
+    # 系统字体列表只查询一次，多个窗口实例共享
+    _available_fonts = None
+    
     def __init__(self):
         # Set language to English by default
         set_language('en')
@@ -609,7 +642,9 @@ class MappingManagerGUI:
         # 在Linux/WSL环境下设置中文字体
         try:
             # 获取系统可用字体
-            available_fonts = list(tkFont.families())
+            if MappingManagerGUI._available_fonts is None:
+                MappingManagerGUI._available_fonts = frozenset(tkFont.families())
+            available_fonts = MappingManagerGUI._available_fonts
             
             # 按优先级尝试中文字体
             chinese_fonts = [
@@ -636,6 +671,14 @@ class MappingManagerGUI:
             print(f"字体设置失败: {e}")
             pass
         
+        # log_name -> (mapping_file, exists), cleared on refresh
+        self._mapping_path_cache = {}
+        # File names in player_mappings/, rescanned on refresh
+        self._mapping_names = set()
+        self._batch_running = False
+        # Currently selected log, filled in by _on_select
+        self._clear_selection_cache()
+        
         self.setup_gui()
         
     def setup_gui(self):
@@ -682,6 +725,7 @@ class MappingManagerGUI:
         columns = (get_text('log_files.columns.filename'), get_text('log_files.columns.status'), 
                   get_text('log_files.columns.players'), get_text('log_files.columns.mapping_file'))
         self.logs_tree = ttk.Treeview(self.logs_frame, columns=columns, show='headings')
+        self.logs_tree.bind('<<TreeviewSelect>>', self._on_select)
         
         column_widths = {get_text('log_files.columns.filename'): 250, get_text('log_files.columns.status'): 100, 
                         get_text('log_files.columns.players'): 80, get_text('log_files.columns.mapping_file'): 250}
@@ -768,9 +812,63 @@ class MappingManagerGUI:
         self.status_text = scrolledtext.ScrolledText(status_frame, wrap=tk.WORD, height=10)
         self.status_text.pack(fill=tk.BOTH, expand=True)
         
+    def _mapping_set(self):
+        """Names of all files in player_mappings/, from a single directory scan"""
+        try:
+            with os.scandir('player_mappings') as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            return set()
+    
+    def _mapping_path_for(self, log_name):
+        """Return (mapping_file, exists) for a log file name, memoized until refresh"""
+        cached = self._mapping_path_cache.get(log_name)
+        if cached is None:
+            base_name = log_name[:-4] if log_name.endswith('.csv') else log_name
+            mapping_file = f'player_mappings/{base_name}_mapping.json'
+            cached = (mapping_file, f'{base_name}_mapping.json' in self._mapping_names)
+            self._mapping_path_cache[log_name] = cached
+        return cached
+    
+    def _clear_selection_cache(self):
+        """Forget the cached selection details"""
+        self._sel_log = None
+        self._sel_base = None
+        self._sel_mapping_path = None
+        self._sel_mapping_exists = False
+    
+    def _on_select(self, event=None):
+        """Cache name and mapping details of the selected log once per selection change"""
+        selected = self.logs_tree.selection()
+        if not selected:
+            self._clear_selection_cache()
+            return
+        
+        log_name = self.logs_tree.item(selected[0])['values'][0]
+        self._sel_log = log_name
+        self._sel_base = log_name[:-4] if log_name.endswith('.csv') else log_name
+        self._sel_mapping_path, self._sel_mapping_exists = self._mapping_path_for(log_name)
+    
+    def _rescan_mappings(self):
+        """Rescan player_mappings/ and drop cached per-log lookups"""
+        self._mapping_path_cache.clear()
+        self._mapping_names = self._mapping_set()
+    
+    def refresh_all(self):
+        """Refresh both the logs treeview and the mappings display from one scan"""
+        self._rescan_mappings()
+        self._populate_logs_tree()
+        self._populate_mappings_text()
+    
     def refresh_logs(self):
         """Refresh the logs treeview"""
+        self._rescan_mappings()
+        self._populate_logs_tree()
+    
+    def _populate_logs_tree(self):
+        """Fill the logs treeview using the current mapping scan"""
         # Clear existing items
+        self._clear_selection_cache()
         for item in self.logs_tree.get_children():
             self.logs_tree.delete(item)
         
@@ -781,29 +879,37 @@ class MappingManagerGUI:
         
         log_files = glob.glob(os.path.join(logs_dir, '*.csv'))
         
+        # Static labels are looked up once per refresh, not per row
+        text_mapped = get_text('log_files.status.mapped')
+        text_not_mapped = get_text('log_files.status.not_mapped')
+        text_error = get_text('log_files.status.error')
+        text_na = get_text('common.na')
+        
         for log_file in sorted(log_files):
             log_name = os.path.basename(log_file)
-            base_name = log_name[:-4] if log_name.endswith('.csv') else log_name
-            mapping_file = f'player_mappings/{base_name}_mapping.json'
+            mapping_file, mapping_exists = self._mapping_path_for(log_name)
             
-            if os.path.exists(mapping_file):
-                status = get_text('log_files.status.mapped')
+            if mapping_exists:
+                status = text_mapped
                 try:
-                    with open(mapping_file, 'r', encoding='utf-8') as f:
-                        mappings = json.load(f)
-                    players_count = len(mappings)
+                    players_count = len(_load_mapping(mapping_file))
                 except:
-                    players_count = get_text('log_files.status.error')
+                    players_count = text_error
             else:
-                status = get_text('log_files.status.not_mapped')
-                players_count = get_text('common.na')
+                status = text_not_mapped
+                players_count = text_na
             
             self.logs_tree.insert('', tk.END, values=(
-                log_name, status, players_count, mapping_file if os.path.exists(mapping_file) else get_text('common.na')
+                log_name, status, players_count, mapping_file if mapping_exists else text_na
             ))
     
     def refresh_mappings(self):
         """Refresh the mappings display"""
+        self._rescan_mappings()
+        self._populate_mappings_text()
+    
+    def _populate_mappings_text(self):
+        """Fill the mappings display using the current mapping scan"""
         self.mappings_text.delete(1.0, tk.END)
         
         mappings_dir = 'player_mappings'
@@ -811,68 +917,66 @@ class MappingManagerGUI:
             self.mappings_text.insert(tk.END, get_text('mappings.no_directory'))
             return
         
-        mapping_files = glob.glob(os.path.join(mappings_dir, '*_mapping.json'))
+        mapping_files = [os.path.join(mappings_dir, name) for name in self._mapping_names
+                         if name.endswith('_mapping.json')]
         if not mapping_files:
             self.mappings_text.insert(tk.END, get_text('mappings.no_files'))
             return
         
-        self.mappings_text.insert(tk.END, get_text('mappings.found_files', count=len(mapping_files)) + "\n\n")
+        # Build the whole overview first and insert it into the widget once
+        parts = [get_text('mappings.found_files', count=len(mapping_files)) + "\n\n"]
+        fmt_players_count = get_formatter('mappings.players_count')
+        fmt_file_path = get_formatter('mappings.file_path')
+        fmt_more = get_formatter('mappings.more_mappings')
+        fmt_read_error = get_formatter('mappings.read_error')
         
         for mapping_file in sorted(mapping_files):
             log_name = os.path.basename(mapping_file).replace('_mapping.json', '')
-            self.mappings_text.insert(tk.END, f"📁 {log_name}\n")
+            parts.append(f"📁 {log_name}\n")
             
             try:
-                with open(mapping_file, 'r', encoding='utf-8') as f:
-                    mappings = json.load(f)
+                mappings = _load_mapping(mapping_file)
                 
-                self.mappings_text.insert(tk.END, get_text('mappings.players_count', count=len(mappings)) + "\n")
-                self.mappings_text.insert(tk.END, get_text('mappings.file_path', path=mapping_file) + "\n")
+                parts.append(fmt_players_count(count=len(mappings)) + "\n")
+                parts.append(fmt_file_path(path=mapping_file) + "\n")
                 
                 # Show first few mappings
                 items = list(mappings.items())[:3]
                 for game_name, real_name in items:
-                    self.mappings_text.insert(tk.END, f"     {game_name[:30]}... -> {real_name}\n")
+                    parts.append(f"     {game_name[:30]}... -> {real_name}\n")
                 
                 if len(mappings) > 3:
-                    self.mappings_text.insert(tk.END, get_text('mappings.more_mappings', count=len(mappings) - 3) + "\n")
+                    parts.append(fmt_more(count=len(mappings) - 3) + "\n")
                     
             except Exception as e:
-                self.mappings_text.insert(tk.END, get_text('mappings.read_error', error=str(e)) + "\n")
+                parts.append(fmt_read_error(error=str(e)) + "\n")
             
-            self.mappings_text.insert(tk.END, "\n")
+            parts.append("\n")
+        
+        self.mappings_text.insert(tk.END, ''.join(parts))
     
     def create_selected_mapping(self):
         """Create mapping for selected log file"""
-        selected = self.logs_tree.selection()
-        if not selected:
+        if not self._sel_log:
             messagebox.showwarning(get_text('dialogs.warning'), get_text('dialogs.select_file_first'))
             return
         
-        item = self.logs_tree.item(selected[0])
-        log_name = item['values'][0]
-        log_file = f'logs/{log_name}'
+        log_file = f'logs/{self._sel_log}'
         
         if create_mapping_for_log(log_file):
+            _MAPPING_CACHE.pop(self._sel_mapping_path, None)
             messagebox.showinfo(get_text('dialogs.success'), get_text('dialogs.mapping_created'))
-            self.refresh_logs()
-            self.refresh_mappings()
+            self.refresh_all()
         else:
             messagebox.showwarning(get_text('dialogs.cancelled'), get_text('dialogs.mapping_cancelled'))
     
     def edit_selected_mapping(self):
         """Edit mapping for selected log file"""
-        selected = self.logs_tree.selection()
-        if not selected:
+        if not self._sel_log:
             messagebox.showwarning(get_text('dialogs.warning'), get_text('dialogs.select_file_first'))
             return
         
-        item = self.logs_tree.item(selected[0])
-        log_name = item['values'][0]
-        base_name = log_name[:-4] if log_name.endswith('.csv') else log_name
-        mapping_file = f'player_mappings/{base_name}_mapping.json'
-        
-        if not os.path.exists(mapping_file):
+        if not self._sel_mapping_exists:
             messagebox.showwarning(get_text('dialogs.warning'), get_text('dialogs.no_mapping_exists'))
             return
         
@@ -882,23 +986,19 @@ class MappingManagerGUI:
     
     def view_mapping_details(self):
         """View details of selected mapping"""
-        selected = self.logs_tree.selection()
-        if not selected:
+        if not self._sel_log:
             messagebox.showwarning(get_text('dialogs.warning'), get_text('dialogs.select_file_first'))
             return
         
-        item = self.logs_tree.item(selected[0])
-        log_name = item['values'][0]
-        base_name = log_name[:-4] if log_name.endswith('.csv') else log_name
-        mapping_file = f'player_mappings/{base_name}_mapping.json'
+        base_name = self._sel_base
+        mapping_file = self._sel_mapping_path
         
-        if not os.path.exists(mapping_file):
+        if not self._sel_mapping_exists:
             messagebox.showwarning(get_text('dialogs.warning'), get_text('dialogs.no_mapping_exists'))
             return
         
         try:
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
+            mappings = _load_mapping(mapping_file)
             
             # Create details window
             details_window = tk.Toplevel(self.root)
@@ -908,13 +1008,14 @@ class MappingManagerGUI:
             # Title
             ttk.Label(details_window, text=get_text('details.header', name=base_name)).pack(pady=10)
             
-            # Mappings display
+            # Mappings display - build the whole listing first and insert it once
             text_widget = scrolledtext.ScrolledText(details_window, wrap=tk.WORD)
             text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
-            text_widget.insert(tk.END, get_text('details.total_mappings', count=len(mappings)) + "\n\n")
-            for game_name, real_name in sorted(mappings.items()):
-                text_widget.insert(tk.END, f"{game_name} -> {real_name}\n")
+            parts = [get_text('details.total_mappings', count=len(mappings)) + "\n\n"]
+            for game_name, real_name in sorted(mappings.items(), key=itemgetter(0)):
+                parts.append(f"{game_name} -> {real_name}\n")
+            text_widget.insert(tk.END, ''.join(parts))
             
             text_widget.config(state=tk.DISABLED)
             
@@ -923,6 +1024,9 @@ class MappingManagerGUI:
     
     def create_all_mappings(self):
         """Create mappings for all unmapped log files"""
+        if self._batch_running:
+            return
+        
         self.status_text.delete(1.0, tk.END)
         self.status_text.insert(tk.END, get_text('batch_ops.starting') + "\n")
         self.status_text.update()
@@ -930,10 +1034,61 @@ class MappingManagerGUI:
         result = messagebox.askyesno(get_text('batch_ops.confirm_title'), 
                                    get_text('batch_ops.confirm_message'))
         if result:
-            create_all_mappings()
-            self.refresh_logs()
-            self.refresh_mappings()
-            self.status_text.insert(tk.END, get_text('batch_ops.complete') + "\n")
+            # Scan the logs in a worker thread; the mapping dialogs are Tk
+            # windows and must be opened from this thread, so the worker only
+            # hands over (log_file, players) pairs through the queue.
+            self._batch_running = True
+            q = queue.Queue()
+            threading.Thread(target=self._scan_unmapped_logs, args=(q,), daemon=True).start()
+            self.root.after(50, self._drain_batch_queue, q)
+    
+    def _scan_unmapped_logs(self, q):
+        """Worker: collect players for every unmapped log file (no Tk calls here)"""
+        try:
+            log_files = sorted(glob.glob(os.path.join('logs', '*.csv')))
+            for log_file in find_unmapped_log_files(log_files):
+                q.put((log_file, _collect_players(log_file)))
+        except Exception as e:
+            q.put(get_text('batch_ops.scan_error', error=str(e)))
+        finally:
+            q.put(None)
+    
+    def _drain_batch_queue(self, q):
+        """Handle queued batch results on the Tk thread"""
+        try:
+            while True:
+                try:
+                    msg = q.get_nowait()
+                except queue.Empty:
+                    self.root.after(50, self._drain_batch_queue, q)
+                    return
+                
+                if msg is None:
+                    try:
+                        _MAPPING_CACHE.clear()
+                        self.refresh_all()
+                        self.status_text.insert(tk.END, get_text('batch_ops.complete') + "\n")
+                    finally:
+                        self._batch_running = False
+                    return
+                if isinstance(msg, str):
+                    self.status_text.insert(tk.END, msg + "\n")
+                    continue
+                
+                log_file, players = msg
+                log_name = os.path.basename(log_file)
+                try:
+                    if create_mapping_for_log(log_file, players=players):
+                        self.status_text.insert(tk.END, get_text('batch_ops.file_created', name=log_name) + "\n")
+                    else:
+                        self.status_text.insert(tk.END, get_text('batch_ops.file_cancelled', name=log_name) + "\n")
+                except Exception as e:
+                    # Report the failed file and carry on with the rest of the batch
+                    self.status_text.insert(tk.END, get_text('batch_ops.file_error', name=log_name, error=str(e)) + "\n")
+        except Exception:
+            # Never leave the batch marked as running, or the button stays dead
+            self._batch_running = False
+            raise
     
     def batch_parse_logs(self):
         """Batch parse all logs with existing mappings"""
@@ -950,91 +1105,74 @@ def run_gui():
     app = MappingManagerGUI()
     app.run()
 
+def supplement_log_cli(log_file):
+    """Supplement missing mappings for a log file, deriving its mapping file path"""
+    log_name_base = os.path.basename(log_file)
+    if log_name_base.endswith('.csv'):
+        log_name_base = log_name_base[:-4]
+    mapping_file = f'player_mappings/{log_name_base}_mapping.json'
+    return supplement_mapping_cli(log_file, mapping_file)
+
+# command -> (handler, message when the required argument is missing or None)
+COMMANDS = {
+    'gui': (run_gui, None),
+    'list': (list_all_mappings, None),
+    'logs': (list_log_files, None),
+    'show': (show_mapping_details, "请提供日志名称"),
+    'create': (create_mapping_for_log, "请提供日志文件路径"),
+    'createcli': (lambda log_file: create_mapping_for_log(log_file, use_cli=True), "请提供日志文件路径"),
+    'createall': (create_all_mappings, None),
+    'createallcli': (create_all_mappings_cli, None),
+    'check': (check_all_mappings_completeness, None),
+    'supplement': (supplement_log_cli, "请提供日志文件路径"),
+    'supplementall': (supplement_all_mappings_cli, None),
+}
+
+HELP_TEXT = """Poker玩家映射管理工具
+{sep}
+用法:
+  python3 manage_mappings.py gui               - 启动GUI界面
+  python3 manage_mappings.py list              - 列出所有映射
+  python3 manage_mappings.py logs              - 列出所有日志文件
+  python3 manage_mappings.py show <log>        - 显示特定日志的映射
+  python3 manage_mappings.py create <log>      - 为日志创建映射(GUI)
+  python3 manage_mappings.py createcli <log>   - 为日志创建映射(命令行)
+  python3 manage_mappings.py createall         - 为所有日志创建映射
+  python3 manage_mappings.py createallcli      - 为所有日志创建映射(命令行)
+  python3 manage_mappings.py check             - 检查所有映射的完整性
+  python3 manage_mappings.py supplement <log>  - 补充单个日志的缺失映射
+  python3 manage_mappings.py supplementall     - 补充所有日志的缺失映射
+
+示例:
+  python3 manage_mappings.py gui
+  python3 manage_mappings.py check
+  python3 manage_mappings.py supplement logs/poker_log.csv
+  python3 manage_mappings.py supplementall
+  python3 manage_mappings.py show poker_now_log_pgl3Rc9zEebTOvy_wTLZXDzsf
+""".format(sep="="*40)
+
 def main():
     import sys
     
     if len(sys.argv) < 2:
-        print("Poker玩家映射管理工具")
-        print("="*40)
-        print("用法:")
-        print("  python3 manage_mappings.py gui               - 启动GUI界面")
-        print("  python3 manage_mappings.py list              - 列出所有映射")
-        print("  python3 manage_mappings.py logs              - 列出所有日志文件")
-        print("  python3 manage_mappings.py show <log>        - 显示特定日志的映射")
-        print("  python3 manage_mappings.py create <log>      - 为日志创建映射(GUI)")
-        print("  python3 manage_mappings.py createcli <log>   - 为日志创建映射(命令行)")
-        print("  python3 manage_mappings.py createall         - 为所有日志创建映射")
-        print("  python3 manage_mappings.py createallcli      - 为所有日志创建映射(命令行)")
-        print("  python3 manage_mappings.py check             - 检查所有映射的完整性")
-        print("  python3 manage_mappings.py supplement <log>  - 补充单个日志的缺失映射")
-        print("  python3 manage_mappings.py supplementall     - 补充所有日志的缺失映射")
-        print("")
-        print("示例:")
-        print("  python3 manage_mappings.py gui")
-        print("  python3 manage_mappings.py check")
-        print("  python3 manage_mappings.py supplement logs/poker_log.csv")
-        print("  python3 manage_mappings.py supplementall")
-        print("  python3 manage_mappings.py show poker_now_log_pgl3Rc9zEebTOvy_wTLZXDzsf")
+        sys.stdout.write(HELP_TEXT)
         return
     
     command = sys.argv[1]
     
-    if command == 'gui':
-        run_gui()
-    
-    elif command == 'list':
-        list_all_mappings()
-    
-    elif command == 'logs':
-        list_log_files()
-    
-    elif command == 'show':
-        if len(sys.argv) < 3:
-            print("请提供日志名称")
-            return
-        log_name = sys.argv[2]
-        show_mapping_details(log_name)
-    
-    elif command == 'create':
-        if len(sys.argv) < 3:
-            print("请提供日志文件路径")
-            return
-        log_file = sys.argv[2]
-        create_mapping_for_log(log_file)
-    
-    elif command == 'createcli':
-        if len(sys.argv) < 3:
-            print("请提供日志文件路径")
-            return
-        log_file = sys.argv[2]
-        create_mapping_for_log(log_file, use_cli=True)
-    
-    elif command == 'createall':
-        create_all_mappings()
-    
-    elif command == 'createallcli':
-        create_all_mappings_cli()
-    
-    elif command == 'check':
-        check_all_mappings_completeness()
-    
-    elif command == 'supplement':
-        if len(sys.argv) < 3:
-            print("请提供日志文件路径")
-            return
-        log_file = sys.argv[2]
-        log_name_base = os.path.basename(log_file)
-        if log_name_base.endswith('.csv'):
-            log_name_base = log_name_base[:-4]
-        mapping_file = f'player_mappings/{log_name_base}_mapping.json'
-        supplement_mapping_cli(log_file, mapping_file)
-    
-    elif command == 'supplementall':
-        supplement_all_mappings_cli()
-    
-    else:
+    entry = COMMANDS.get(command)
+    if entry is None:
         print(f"未知命令: {command}")
         print("使用 'python3 manage_mappings.py' 查看帮助")
+        return
+    
+    handler, missing_arg_message = entry
+    if missing_arg_message is None:
+        handler()
+    elif len(sys.argv) < 3:
+        print(missing_arg_message)
+    else:
+        handler(sys.argv[2])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
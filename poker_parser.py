@@ -1,13 +1,77 @@
 #!/usr/bin/env python3
 import csv
 import re
+from collections import Counter, defaultdict
 from datetime import datetime
+from functools import cached_property
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from itertools import chain, islice
+from operator import itemgetter
+from typing import List, Dict, Optional, Tuple, NamedTuple, Iterator
 import json
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Precompiled patterns for the PokerNow log format
+_RE_QUOTED = re.compile(r'"([^"]+)"')
+_RE_DIGITS = re.compile(r'\d+')
+_RE_CARD = re.compile(r'[AKQJT2-9][♠♥♦♣]')
+_RE_FLOP_BRACKET = re.compile(r'\[(.*?)\]')
+_RE_BRACKET = re.compile(r'\[([^]]+)\]')
+_RE_SHOWS = re.compile(r'shows a (.+)')
+_RE_SHOWS_PLAYER = re.compile(r'"([^"]+)" shows a')
+
+# Player names in action, dealer and stack entries, as one alternation so each
+# entry is scanned once; the name is in whichever group matched (lastindex).
+# Shared with manage_mappings so both agree on who counts as a player.
+PLAYER_NAME_RE = re.compile(
+    r'"([^"]+)" (?:folds|calls|bets|raises|checks|posts|collected)'
+    r'|dealer: "([^"]+)"'
+    r'|Player stacks:.*?"([^"]+)"'
+)
+
+# All player actions as one alternation, so each entry is scanned once.
+# Alternatives keep the old priority order (more specific patterns first).
+_RE_ACTION = re.compile(
+    r'"(?P<p_sb>[^"]+)" posts a small blind of (?P<v_sb>\d+)'
+    r'|"(?P<p_bb>[^"]+)" posts a big blind of (?P<v_bb>\d+)'
+    r'|"(?P<p_rt>[^"]+)" raises to (?P<v_rt>\d+)'
+    r'|"(?P<p_rb>[^"]+)" raises by (?P<v_rb>\d+)'
+    r'|"(?P<p_bet>[^"]+)" bets (?P<v_bet>\d+)'
+    r'|"(?P<p_call>[^"]+)" calls (?P<v_call>\d+)'
+    r'|"(?P<p_allin>[^"]+)" goes all-in with (?P<v_allin>\d+)'
+    r'|"(?P<p_fold>[^"]+)" folds'
+    r'|"(?P<p_check>[^"]+)" checks'
+    r'|"(?P<p_win>[^"]+)" collected (?P<v_win>\d+) from pot'
+    r'|Uncalled bet of (?P<v_ret>\d+) returned to "(?P<p_ret>[^"]+)"'
+)
+
+# Section rules for the text summary report
+_RULE_WINS = "-" * 20 + "\n"
+_RULE_ACTIONS = "-" * 25 + "\n"
+
+# Action types tallied per player in get_statistics, in report order
+_STAT_ACTIONS = ('fold', 'call', 'bet', 'raise', 'check', 'all-in', 'blind')
+
+# match.lastgroup -> (action_type, player group, amount group)
+_ACTION_KINDS = {
+    'v_sb': ('blind', 'p_sb', 'v_sb'),
+    'v_bb': ('blind', 'p_bb', 'v_bb'),
+    'v_rt': ('raise', 'p_rt', 'v_rt'),
+    'v_rb': ('raise', 'p_rb', 'v_rb'),
+    'v_bet': ('bet', 'p_bet', 'v_bet'),
+    'v_call': ('call', 'p_call', 'v_call'),
+    'v_allin': ('all-in', 'p_allin', 'v_allin'),
+    'p_fold': ('fold', 'p_fold', None),
+    'p_check': ('check', 'p_check', None),
+    'v_win': ('win', 'p_win', 'v_win'),
+    'p_ret': ('return', 'p_ret', 'v_ret'),
+}
 
 class PlayerNameMapper:
     def __init__(self, log_file_path: str = None):
@@ -144,14 +208,49 @@ class PlayerNameMapper:
         
         return result['confirmed']
 
-@dataclass
-class PlayerAction:
+class PlayerAction(NamedTuple):
     player: str
     action: str  # fold, call, bet, raise, check, blind
     amount: Optional[int] = None
     timestamp: str = None
     stage: str = "preflop"  # preflop, flop, turn, river
 
+@dataclass
+class StageActions:
+    """Actions of one betting round, stored as parallel columns"""
+    stage: str
+    players: List[str] = None
+    actions: List[str] = None
+    amounts: List[Optional[int]] = None
+    timestamps: List[str] = None
+    
+    def __post_init__(self):
+        if self.players is None:
+            self.players = []
+        if self.actions is None:
+            self.actions = []
+        if self.amounts is None:
+            self.amounts = []
+        if self.timestamps is None:
+            self.timestamps = []
+    
+    def append(self, player: str, action: str, amount: Optional[int] = None, timestamp: str = None):
+        self.players.append(player)
+        self.actions.append(action)
+        self.amounts.append(amount)
+        self.timestamps.append(timestamp)
+    
+    def __len__(self) -> int:
+        return len(self.players)
+    
+    def iter_actions(self) -> Iterator[PlayerAction]:
+        """Yield the actions row-wise as PlayerAction tuples"""
+        stage = self.stage
+        for player, action, amount, timestamp in zip(self.players, self.actions, self.amounts, self.timestamps):
+            yield PlayerAction(player, action, amount, timestamp, stage)
+    
+    __iter__ = iter_actions
+
 @dataclass
 class ShowdownInfo:
     player: str
@@ -167,10 +266,10 @@ class PokerHand:
     player_stacks: Dict[str, int]
     
     # Actions organized by stage
-    preflop_actions: List[PlayerAction] = None
-    flop_actions: List[PlayerAction] = None
-    turn_actions: List[PlayerAction] = None
-    river_actions: List[PlayerAction] = None
+    preflop_actions: StageActions = None
+    flop_actions: StageActions = None
+    turn_actions: StageActions = None
+    river_actions: StageActions = None
     
     # Community cards by stage
     flop_cards: List[str] = None
@@ -194,13 +293,13 @@ class PokerHand:
     
     def __post_init__(self):
         if self.preflop_actions is None:
-            self.preflop_actions = []
+            self.preflop_actions = StageActions('preflop')
         if self.flop_actions is None:
-            self.flop_actions = []
+            self.flop_actions = StageActions('flop')
         if self.turn_actions is None:
-            self.turn_actions = []
+            self.turn_actions = StageActions('turn')
         if self.river_actions is None:
-            self.river_actions = []
+            self.river_actions = StageActions('river')
         if self.showdown is None:
             self.showdown = []
         # Initialize run it twice fields
@@ -211,12 +310,17 @@ class PokerHand:
         if self.river_card_second is None:
             self.river_card_second = None
     
-    @property
+    @cached_property
     def all_actions(self) -> List[PlayerAction]:
         """Get all actions across all stages"""
-        return self.preflop_actions + self.flop_actions + self.turn_actions + self.river_actions
+        return list(chain(self.preflop_actions, self.flop_actions, self.turn_actions, self.river_actions))
     
     @property
+    def stages(self) -> Tuple[StageActions, ...]:
+        """Per-stage action columns in street order"""
+        return (self.preflop_actions, self.flop_actions, self.turn_actions, self.river_actions)
+    
+    @cached_property
     def community_cards(self) -> List[str]:
         """Get all community cards"""
         cards = []
@@ -227,6 +331,11 @@ class PokerHand:
         if self.river_card:
             cards.append(self.river_card)
         return cards
+    
+    def finalize(self):
+        """Mark the hand as complete; drops any views cached while it was still being parsed"""
+        self.__dict__.pop('all_actions', None)
+        self.__dict__.pop('community_cards', None)
 
 class PokerLogParser:
     def __init__(self, log_file_path: str = None):
@@ -235,6 +344,8 @@ class PokerLogParser:
         self.current_stage: str = "preflop"
         self.name_mapper = PlayerNameMapper(log_file_path)
         self.all_players = set()
+        # raw (quoted) name -> mapped real name, see clean_player_name
+        self._name_cache: Dict[str, str] = {}
         self.log_file_path = log_file_path
         
         # Setup output directory
@@ -249,10 +360,25 @@ class PokerLogParser:
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # entry[:4] -> (full prefix, handler) for lines with a fixed leading keyword
+        self._prefix_handlers = {
+            '-- s': ('-- starting hand #', self._handle_hand_start),
+            '-- e': ('-- ending hand #', self._handle_hand_end),
+            'Play': ('Player stacks:', self._handle_player_stacks),
+            'Flop': ('Flop', self._handle_flop),
+            'Turn': ('Turn', self._handle_turn),
+            'Rive': ('River', self._handle_river),
+        }
+        
     def clean_player_name(self, name: str) -> str:
         """Extract clean player name from quoted format"""
+        # The same handful of players appear on every line, so memoize
+        real_name = self._name_cache.get(name)
+        if real_name is not None:
+            return real_name
+        
         if '"' in name:
-            match = re.search(r'"([^"]+)"', name)
+            match = _RE_QUOTED.search(name)
             game_name = match.group(1) if match else name
         else:
             game_name = name
@@ -261,22 +387,23 @@ class PokerLogParser:
         self.all_players.add(game_name)
         
         # Return real name if mapped, otherwise game name
-        return self.name_mapper.get_real_name(game_name)
+        real_name = self.name_mapper.get_real_name(game_name)
+        self._name_cache[name] = real_name
+        return real_name
     
     def parse_amount(self, text: str) -> Optional[int]:
         """Extract amount from action text"""
-        numbers = re.findall(r'\d+', text)
+        numbers = _RE_DIGITS.findall(text)
         return int(numbers[0]) if numbers else None
     
     def parse_cards(self, text: str) -> List[str]:
         """Extract cards from flop/turn/river text"""
-        card_pattern = r'[AKQJT2-9][♠♥♦♣]'
-        return re.findall(card_pattern, text)
+        return _RE_CARD.findall(text)
     
     def parse_flop_cards(self, text: str) -> List[str]:
         """Parse flop cards from text like 'Flop: [Q♥, 6♠, 8♣]'"""
         # Extract cards within brackets
-        bracket_match = re.search(r'\[(.*?)\]', text)
+        bracket_match = _RE_FLOP_BRACKET.search(text)
         if bracket_match:
             cards_str = bracket_match.group(1)
             return self.parse_cards(cards_str)
@@ -285,7 +412,7 @@ class PokerLogParser:
     def parse_turn_river_card(self, text: str) -> str:
         """Parse turn/river card from text like 'Turn: Q♥, 6♠, 8♣ [9♥]' """
         # Find the card in the final bracket
-        bracket_match = re.search(r'\[([^]]+)\]', text)
+        bracket_match = _RE_BRACKET.search(text)
         if bracket_match:
             card_str = bracket_match.group(1)
             cards = self.parse_cards(card_str)
@@ -295,7 +422,7 @@ class PokerLogParser:
     def parse_hole_cards(self, text: str) -> List[str]:
         """Parse hole cards from showdown text like 'shows a 7♠, 10♥' or 'shows a K♥'"""
         # Find cards after "shows a"
-        match = re.search(r'shows a (.+)', text)
+        match = _RE_SHOWS.search(text)
         if match:
             cards_str = match.group(1).rstrip('.')
             return self.parse_cards(cards_str)
@@ -304,109 +431,149 @@ class PokerLogParser:
     def parse_player_stacks(self, text: str) -> Dict[str, int]:
         """Parse player stacks from stack line"""
         stacks = {}
-        # Pattern: "Player Name @ id" (amount)
-        pattern = r'"([^"]+)"\s*\((\d+)\)'
-        matches = re.findall(pattern, text)
-        for name, amount in matches:
-            real_name = self.clean_player_name(f'"{name}"')
-            stacks[real_name] = int(amount)
+        # Pattern: #1 "Player Name @ id" (amount) | #2 ...
+        for chunk in text.split(' | '):
+            name, sep, rest = chunk.partition('"')[2].partition('"')
+            amount = rest.strip()
+            if not (name and sep and amount[:1] == '(' and amount[-1:] == ')'):
+                continue
+            amount = amount[1:-1]
+            if amount.isdecimal():
+                real_name = self.clean_player_name(f'"{name}"')
+                stacks[real_name] = int(amount)
         return stacks
     
-    def parse_log_file(self, file_path: str):
-        """Parse the poker log CSV file"""
-        # First read all rows and sort by order (ascending to get chronological order)
+    def read_log_rows(self, file_path: str) -> List[Tuple[int, str, str]]:
+        """Read the poker log CSV file and return (order, entry, at) rows in chronological order"""
         rows = []
         with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append(row)
-        
-        # Sort by order column in ascending order to get chronological sequence
-        # The log file is in reverse chronological order, so we need to reverse it
-        rows.sort(key=lambda x: int(x['order']) if x['order'].isdigit() else 0)
-        
-        # Now process entries in chronological order
-        for row in rows:
-            entry = row['entry']
-            timestamp = row['at']
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return rows
+            order_col = header.index('order')
+            entry_col = header.index('entry')
+            at_col = header.index('at')
             
-            self.process_entry(entry, timestamp)
+            for row in reader:
+                if not row:
+                    continue
+                order = row[order_col]
+                rows.append((int(order) if order.isdigit() else 0, row[entry_col], row[at_col]))
+        
+        # The log file is in reverse chronological order, so a plain reverse
+        # gives the chronological sequence; only fall back to sorting by the
+        # order column when the file is not strictly descending
+        if all(rows[k][0] > rows[k + 1][0] for k in range(len(rows) - 1)):
+            rows.reverse()
+        else:
+            rows.sort(key=itemgetter(0))
+        return rows
+    
+    def collect_players(self, rows: List[Tuple[int, str, str]]):
+        """Quick pass over log rows that only records game names in all_players"""
+        for _, entry, _ in rows:
+            self.all_players.update(match.group(match.lastindex)
+                                    for match in PLAYER_NAME_RE.finditer(entry))
+    
+    def parse_log_file(self, file_path: str, rows: List[Tuple[int, str, str]] = None):
+        """Parse the poker log CSV file
+        
+        Pass ``rows`` from read_log_rows to reuse an already loaded log.
+        """
+        if rows is None:
+            rows = self.read_log_rows(file_path)
+        
+        # Now process entries in chronological order. process_entry carries
+        # hand/stage state from line to line, so this stays a single pass;
+        # the bound method is looked up once rather than per row.
+        process_entry = self.process_entry
+        for _, entry, timestamp in rows:
+            process_entry(entry, timestamp)
         
         # Finalize the last hand if exists
         if self.current_hand:
+            self.current_hand.finalize()
             self.hands.append(self.current_hand)
     
-    def process_entry(self, entry: str, timestamp: str):
-        """Process a single log entry"""
+    def _handle_hand_start(self, entry: str, timestamp: str):
+        """Handle a '-- starting hand #' line"""
+        if self.current_hand:
+            self.current_hand.finalize()
+            self.hands.append(self.current_hand)
         
-        # Start of new hand
-        if "-- starting hand #" in entry:
-            if self.current_hand:
-                self.hands.append(self.current_hand)
+        # Extract hand info: ... hand #N (id: ID) ... (dealer: "Name @ id") --
+        num_str, sep_id, rest = entry.partition('hand #')[2].partition(' (id: ')
+        hand_id, sep_close, rest = rest.partition(')')
+        dealer_name, sep_quote, _ = rest.partition('dealer: "')[2].partition('"')
+        if sep_id and sep_close and sep_quote and num_str.isdecimal() and hand_id and dealer_name:
+            hand_num = int(num_str)
+            dealer = self.clean_player_name(f'"{dealer_name}"')
             
-            # Extract hand info
-            hand_match = re.search(r'hand #(\d+) \(id: (\w+)\).*dealer: "([^"]+)"', entry)
-            if hand_match:
-                hand_num = int(hand_match.group(1))
-                hand_id = hand_match.group(2)
-                dealer = self.clean_player_name(f'"{hand_match.group(3)}"')
-                
-                self.current_hand = PokerHand(
-                    hand_id=hand_id,
-                    hand_number=hand_num,
-                    dealer=dealer,
-                    players=[],
-                    player_stacks={},
-                    timestamp=timestamp,
-                    flop_cards_second=None,
-                    turn_card_second=None,
-                    river_card_second=None,
-                    run_it_twice=False
-                )
-                self.current_stage = "preflop"
-        
-        # End of hand
-        elif "-- ending hand #" in entry:
-            if self.current_hand:
-                # Hand is complete, will be added to list when next hand starts
-                pass
-        
-        # Player stacks
-        elif "Player stacks:" in entry:
-            if self.current_hand:
-                stacks = self.parse_player_stacks(entry)
-                self.current_hand.player_stacks = stacks
-                self.current_hand.players = list(stacks.keys())
-        
-        # Community cards - Flop
-        elif entry.startswith("Flop"):
-            if self.current_hand:
-                self.current_stage = "flop"
-                if "(second run)" in entry:
-                    self.current_hand.flop_cards_second = self.parse_flop_cards(entry)
-                    self.current_hand.run_it_twice = True
-                else:
-                    self.current_hand.flop_cards = self.parse_flop_cards(entry)
-        
-        # Turn
-        elif entry.startswith("Turn"):
-            if self.current_hand:
-                self.current_stage = "turn"
-                if "(second run)" in entry:
-                    self.current_hand.turn_card_second = self.parse_turn_river_card(entry)
-                    self.current_hand.run_it_twice = True
-                else:
-                    self.current_hand.turn_card = self.parse_turn_river_card(entry)
+            self.current_hand = PokerHand(
+                hand_id=hand_id,
+                hand_number=hand_num,
+                dealer=dealer,
+                players=[],
+                player_stacks={},
+                timestamp=timestamp,
+                flop_cards_second=None,
+                turn_card_second=None,
+                river_card_second=None,
+                run_it_twice=False
+            )
+            self.current_stage = "preflop"
+    
+    def _handle_hand_end(self, entry: str, timestamp: str):
+        """Handle a '-- ending hand #' line"""
+        # Hand is complete, will be added to list when next hand starts
+        pass
+    
+    def _handle_player_stacks(self, entry: str, timestamp: str):
+        """Handle a 'Player stacks:' line"""
+        if self.current_hand:
+            stacks = self.parse_player_stacks(entry)
+            self.current_hand.player_stacks = stacks
+            self.current_hand.players = list(stacks.keys())
+    
+    def _handle_flop(self, entry: str, timestamp: str):
+        """Handle a 'Flop' community cards line"""
+        if self.current_hand:
+            self.current_stage = "flop"
+            if "(second run)" in entry:
+                self.current_hand.flop_cards_second = self.parse_flop_cards(entry)
+                self.current_hand.run_it_twice = True
+            else:
+                self.current_hand.flop_cards = self.parse_flop_cards(entry)
+    
+    def _handle_turn(self, entry: str, timestamp: str):
+        """Handle a 'Turn' community card line"""
+        if self.current_hand:
+            self.current_stage = "turn"
+            if "(second run)" in entry:
+                self.current_hand.turn_card_second = self.parse_turn_river_card(entry)
+                self.current_hand.run_it_twice = True
+            else:
+                self.current_hand.turn_card = self.parse_turn_river_card(entry)
+    
+    def _handle_river(self, entry: str, timestamp: str):
+        """Handle a 'River' community card line"""
+        if self.current_hand:
+            self.current_stage = "river"
+            if "(second run)" in entry:
+                self.current_hand.river_card_second = self.parse_turn_river_card(entry)
+                self.current_hand.run_it_twice = True
+            else:
+                self.current_hand.river_card = self.parse_turn_river_card(entry)
+    
+    def process_entry(self, entry: str, timestamp: str):
+        """Process a single log entry"""
         
-        # River
-        elif entry.startswith("River"):
-            if self.current_hand:
-                self.current_stage = "river"
-                if "(second run)" in entry:
-                    self.current_hand.river_card_second = self.parse_turn_river_card(entry)
-                    self.current_hand.run_it_twice = True
-                else:
-                    self.current_hand.river_card = self.parse_turn_river_card(entry)
+        # Hand boundaries, stacks and community cards all start with a fixed
+        # keyword, so one dict probe on the first characters picks the handler
+        handler = self._prefix_handlers.get(entry[:4])
+        if handler is not None and entry.startswith(handler[0]):
+            handler[1](entry, timestamp)
         
         # Run it twice decision messages
         elif "run it twice" in entry:
@@ -416,7 +583,7 @@ class PokerLogParser:
         # Showdown - player shows cards
         elif " shows a " in entry:
             if self.current_hand:
-                match = re.search(r'"([^"]+)" shows a', entry)
+                match = _RE_SHOWS_PLAYER.search(entry)
                 if match:
                     player = self.clean_player_name(f'"{match.group(1)}"')
                     hole_cards = self.parse_hole_cards(entry)
@@ -425,57 +592,26 @@ class PokerLogParser:
         
         # Player actions
         elif self.current_hand:
-            action_patterns = [
-                # More specific patterns first to avoid incorrect matching  
-                (r'"([^"]+)" posts a small blind of (\d+)', 'blind'),
-                (r'"([^"]+)" posts a big blind of (\d+)', 'blind'),
-                (r'"([^"]+)" raises to (\d+)', 'raise'),
-                (r'"([^"]+)" raises by (\d+)', 'raise'),
-                (r'"([^"]+)" bets (\d+)', 'bet'),
-                (r'"([^"]+)" calls (\d+)', 'call'),
-                (r'"([^"]+)" goes all-in with (\d+)', 'all-in'),
-                (r'"([^"]+)" folds', 'fold'),
-                (r'"([^"]+)" checks', 'check'),
-                (r'"([^"]+)" collected (\d+) from pot', 'win'),
-                (r'Uncalled bet of (\d+) returned to "([^"]+)"', 'return')
-            ]
-            
-            for pattern, action_type in action_patterns:
-                match = re.search(pattern, entry)
-                if match:
-                    if action_type == 'win':
-                        player = self.clean_player_name(f'"{match.group(1)}"')
-                        amount = int(match.group(2))
-                        self.current_hand.winner = player
-                        self.current_hand.winning_amount = amount
-                        self.current_hand.pot_size = amount
-                    elif action_type == 'return':
-                        # Skip uncalled bets for now
-                        pass
-                    else:
-                        player = self.clean_player_name(f'"{match.group(1)}"')
-                        amount = None
-                        if len(match.groups()) > 1 and match.group(2).isdigit():
-                            amount = int(match.group(2))
-                        
-                        action = PlayerAction(
-                            player=player,
-                            action=action_type,
-                            amount=amount,
-                            timestamp=timestamp,
-                            stage=self.current_stage
-                        )
-                        
-                        # Add to appropriate stage
-                        if self.current_stage == "preflop":
-                            self.current_hand.preflop_actions.append(action)
-                        elif self.current_stage == "flop":
-                            self.current_hand.flop_actions.append(action)
-                        elif self.current_stage == "turn":
-                            self.current_hand.turn_actions.append(action)
-                        elif self.current_stage == "river":
-                            self.current_hand.river_actions.append(action)
-                    break
+            match = _RE_ACTION.search(entry)
+            if match:
+                action_type, player_group, amount_group = _ACTION_KINDS[match.lastgroup]
+                if action_type == 'win':
+                    player = self.clean_player_name(f'"{match.group(player_group)}"')
+                    amount = int(match.group(amount_group))
+                    self.current_hand.winner = player
+                    self.current_hand.winning_amount = amount
+                    self.current_hand.pot_size = amount
+                elif action_type == 'return':
+                    # Skip uncalled bets for now
+                    pass
+                else:
+                    player = self.clean_player_name(f'"{match.group(player_group)}"')
+                    amount = int(match.group(amount_group)) if amount_group else None
+                    
+                    # Add to appropriate stage
+                    stage_actions = getattr(self.current_hand, f'{self.current_stage}_actions', None)
+                    if stage_actions is not None:
+                        stage_actions.append(player, action_type, amount, timestamp)
     
     def get_statistics(self) -> Dict:
         """Get basic statistics from parsed hands"""
@@ -485,7 +621,7 @@ class PokerLogParser:
             'total_pot': 0,
             'biggest_pot': 0,
             'player_wins': {},
-            'player_actions': {}
+            'player_actions': defaultdict(Counter)
         }
         
         for hand in self.hands:
@@ -502,14 +638,16 @@ class PokerLogParser:
                 stats['player_wins'][hand.winner] = stats['player_wins'].get(hand.winner, 0) + 1
             
             # Action statistics
-            for action in hand.all_actions:
-                player = action.player
-                if player not in stats['player_actions']:
-                    stats['player_actions'][player] = {'fold': 0, 'call': 0, 'bet': 0, 'raise': 0, 'check': 0, 'all-in': 0, 'blind': 0}
-                if action.action in stats['player_actions'][player]:
-                    stats['player_actions'][player][action.action] += 1
+            for stage_actions in hand.stages:
+                for player, action in zip(stage_actions.players, stage_actions.actions):
+                    stats['player_actions'][player][action] += 1
         
         stats['players'] = list(stats['players'])
+        # Plain dicts with every action type present, for the JSON export
+        stats['player_actions'] = {
+            player: {action: counts[action] for action in _STAT_ACTIONS}
+            for player, counts in stats['player_actions'].items()
+        }
         return stats
     
     def export_to_json(self, output_file: str = None):
@@ -519,15 +657,17 @@ class PokerLogParser:
         hands_dict = []
         for hand in self.hands:
             def actions_to_dict(actions):
+                stage = actions.stage
                 return [
                     {
-                        'player': action.player,
-                        'action': action.action,
-                        'amount': action.amount,
-                        'timestamp': action.timestamp,
-                        'stage': action.stage
+                        'player': player,
+                        'action': action,
+                        'amount': amount,
+                        'timestamp': timestamp,
+                        'stage': stage
                     }
-                    for action in actions
+                    for player, action, amount, timestamp in zip(
+                        actions.players, actions.actions, actions.amounts, actions.timestamps)
                 ]
             
             hand_dict = {
@@ -541,7 +681,6 @@ class PokerLogParser:
                 'flop_cards': hand.flop_cards,
                 'turn_card': hand.turn_card,
                 'river_card': hand.river_card,
-                'community_cards': hand.community_cards,  # All cards combined
                 
                 # Run it twice cards
                 'run_it_twice': hand.run_it_twice,
@@ -554,7 +693,6 @@ class PokerLogParser:
                 'flop_actions': actions_to_dict(hand.flop_actions),
                 'turn_actions': actions_to_dict(hand.turn_actions),
                 'river_actions': actions_to_dict(hand.river_actions),
-                'all_actions': actions_to_dict(hand.all_actions),  # All actions combined
                 
                 # Showdown info
                 'showdown': [
@@ -574,8 +712,14 @@ class PokerLogParser:
             }
             hands_dict.append(hand_dict)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(hands_dict, f, indent=2, ensure_ascii=False)
+        # all_actions / community_cards are left out: both are derivable from
+        # the per-stage fields (see the PokerHand properties)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(hands_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(hands_dict, f, indent=2, ensure_ascii=False)
     
     def export_statistics(self, output_file: str = None):
         """Export game statistics to JSON"""
@@ -594,83 +738,58 @@ class PokerLogParser:
         
         stats = self.get_statistics()
         
+        # Build the report in memory and write it out in one call
+        parts = ["Poker Game Analysis Report\n",
+                 "========================\n\n"]
+        
+        if self.log_file_path:
+            parts.append(f"Log File: {os.path.basename(self.log_file_path)}\n")
+        
+        parts.append(f"Total Hands: {stats['total_hands']}\n")
+        parts.append(f"Total Players: {len(stats['players'])}\n")
+        parts.append(f"Total Pot Amount: {stats['total_pot']}\n")
+        parts.append(f"Biggest Pot: {stats['biggest_pot']}\n\n")
+        
+        parts.append(f"Players: {', '.join(stats['players'])}\n\n")
+        
+        parts.append("Player Win Counts:\n")
+        parts.append(_RULE_WINS)
+        for player, wins in sorted(stats['player_wins'].items(), 
+                                 key=itemgetter(1), reverse=True):
+            parts.append(f"{player}: {wins} wins\n")
+        
+        parts.append("\nPlayer Actions Summary:\n")
+        parts.append(_RULE_ACTIONS)
+        for player, actions in stats['player_actions'].items():
+            total_actions = sum(actions.values())
+            parts.append(f"{player}: {total_actions} total actions\n")
+            for action, count in actions.items():
+                if count > 0:
+                    parts.append(f"  {action}: {count}\n")
+            parts.append("\n")
+        
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"Poker Game Analysis Report\n")
-            f.write(f"========================\n\n")
-            
-            if self.log_file_path:
-                f.write(f"Log File: {os.path.basename(self.log_file_path)}\n")
-            
-            f.write(f"Total Hands: {stats['total_hands']}\n")
-            f.write(f"Total Players: {len(stats['players'])}\n")
-            f.write(f"Total Pot Amount: {stats['total_pot']}\n")
-            f.write(f"Biggest Pot: {stats['biggest_pot']}\n\n")
-            
-            f.write(f"Players: {', '.join(stats['players'])}\n\n")
-            
-            f.write("Player Win Counts:\n")
-            f.write("-" * 20 + "\n")
-            for player, wins in sorted(stats['player_wins'].items(), 
-                                     key=lambda x: x[1], reverse=True):
-                f.write(f"{player}: {wins} wins\n")
-            
-            f.write("\nPlayer Actions Summary:\n")
-            f.write("-" * 25 + "\n")
-            for player, actions in stats['player_actions'].items():
-                total_actions = sum(actions.values())
-                f.write(f"{player}: {total_actions} total actions\n")
-                for action, count in actions.items():
-                    if count > 0:
-                        f.write(f"  {action}: {count}\n")
-                f.write("\n")
+            f.write(''.join(parts))
 
 def main():
     log_file = 'logs/poker_now_log_pgl3Rc9zEebTOvy_wTLZXDzsf.csv'
     
-    # First pass: collect all player names
-    parser_temp = PokerLogParser(log_file)
+    parser = PokerLogParser(log_file)
     
+    # Load the log once; the same rows feed the player scan and the parse
     print("收集玩家名单...")
-    # Read and sort rows by order (chronological)
-    rows = []
-    with open(log_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
-    
-    # Sort by order to get chronological sequence
-    rows.sort(key=lambda x: int(x['order']) if x['order'].isdigit() else 0)
-    
-    # Extract player names from entries in chronological order
-    for row in rows:
-        entry = row['entry']
-        # Extract player names from various patterns
-        patterns = [
-            r'"([^"]+)" folds',
-            r'"([^"]+)" calls',
-            r'"([^"]+)" bets',
-            r'"([^"]+)" raises',
-            r'"([^"]+)" checks',
-            r'"([^"]+)" posts',
-            r'"([^"]+)" collected',
-            r'dealer: "([^"]+)"',
-            r'Player stacks:.*?"([^"]+)"'
-        ]
-        for pattern in patterns:
-            matches = re.findall(pattern, entry)
-            for match in matches:
-                parser_temp.all_players.add(match)
+    rows = parser.read_log_rows(log_file)
+    parser.collect_players(rows)
     
     # Show mapping dialog
-    print(f"发现 {len(parser_temp.all_players)} 个玩家")
-    if not parser_temp.name_mapper.show_mapping_dialog(list(parser_temp.all_players)):
+    print(f"发现 {len(parser.all_players)} 个玩家")
+    if not parser.name_mapper.show_mapping_dialog(list(parser.all_players)):
         print("用户取消了映射设置")
         return
     
     # Now parse with mappings
-    parser = PokerLogParser(log_file)
     print(f"解析 {log_file}...")
-    parser.parse_log_file(log_file)
+    parser.parse_log_file(log_file, rows=rows)
     
     print(f"Parsed {len(parser.hands)} hands")
     
@@ -724,7 +843,7 @@ def main():
         # Show actions by stage
         if sample.preflop_actions:
             print(f"Preflop actions ({len(sample.preflop_actions)}):")
-            for action in sample.preflop_actions[:5]:  # Show first 5
+            for action in islice(sample.preflop_actions, 5):  # Show first 5
                 amount_str = f" {action.amount}" if action.amount else ""
                 print(f"  {action.player}: {action.action}{amount_str}")
         
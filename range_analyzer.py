@@ -20,32 +20,186 @@ Range Analyzer - 玩家范围分析器
 - Others: 其他牌型
 """
 
+import contextlib
+import csv
+import io
 import json
 import os
+import sys
 import glob
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import matplotlib
 matplotlib.use('Agg')  # 使用无GUI后端
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
 from typing import Dict, List, Any, Tuple
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, namedtuple
+from array import array
+from functools import partial
 import re
+try:
+    import ijson  # 大文件流式解析
+except ImportError:
+    ijson = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 牌面字符 -> 索引 (2=0 ... A=12)，用于起手牌查找表
+_RANK_ORDER = '23456789TJQKA'
+_RANK_INDEX = {r: i for i, r in enumerate(_RANK_ORDER)}
+# 牌面 -> 大小数值 (2=2 ... A=14)
+_RANK_VAL = {r: i + 2 for i, r in enumerate(_RANK_ORDER)}
+# 字符码 -> 牌面索引 (非牌面字符为-1)，用于批量向量化分类
+_RANK_LUT = np.full(128, -1, dtype=np.int16)
+_RANK_LUT[[ord(r) for r in _RANK_ORDER]] = np.arange(len(_RANK_ORDER))
+
+def _hand_keys(rank_codes, suit_codes):
+    """字符码 -> 查找表索引 (NumPy向量化)，含无法识别牌面的手牌记为-1"""
+    idx = _RANK_LUT[np.minimum(rank_codes, 127)]
+    hi = idx.max(axis=1)
+    lo = idx.min(axis=1)
+    keys = (hi * 13 + lo) * 2 + (suit_codes[:, 0] == suit_codes[:, 1])
+    keys[lo < 0] = -1
+    return keys
+
+# 超过该大小的enhanced_hands.json用ijson逐手流式解析
+_STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+def _stream_hands(f):
+    """逐手产出JSON数组中的元素，读完后关闭文件"""
+    with f:
+        yield from ijson.items(f, 'item')
+
+def load_enhanced_hands(enhanced_hands_file: str):
+    """读取enhanced_hands.json: 大文件流式逐手解析，其余一次性读入"""
+    if ijson is not None and os.path.getsize(enhanced_hands_file) >= _STREAM_MIN_BYTES:
+        return _stream_hands(open(enhanced_hands_file, 'rb'))
+    
+    with open(enhanced_hands_file, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+# 单张牌 <-> 编码 (rank_idx<<2 | suit_idx, 0..51)
+_SUIT_ORDER = '♠♥♦♣'
+_CARD_STR = [r + s for r in _RANK_ORDER for s in _SUIT_ORDER]
+_CARD_CODE = {card: code for code, card in enumerate(_CARD_STR)}
+
+def _pack_cards(hole_cards: List[str]):
+    """两张底牌打包成一个16位整数 (c1<<8 | c2)，含无法编码的牌时原样返回"""
+    c1 = _CARD_CODE.get(hole_cards[0])
+    c2 = _CARD_CODE.get(hole_cards[1])
+    if c1 is None or c2 is None:
+        return hole_cards
+    return (c1 << 8) | c2
+
+def _unpack_cards(cards) -> List[str]:
+    """_pack_cards的逆操作，仅在导出时解码"""
+    if isinstance(cards, int):
+        return [_CARD_STR[cards >> 8], _CARD_STR[cards & 0xff]]
+    return cards
+
+# 范围数据中的单条亮牌记录 (cards为_pack_cards打包后的底牌)
+HandRec = namedtuple('HandRec', 'cards normalized action_line hand_id')
+# 缺少行动线时的默认值 (驻留的单例字符串)
+_UNKNOWN = sys.intern("Unknown")
 
 class RangeAnalyzer:
+    # 牌型类别 (汇总表的列顺序)
+    CATEGORIES = (
+        "Premium Pairs", "Medium Pairs", "Small Pairs",
+        "Strong Aces", "Medium Aces", "Weak Aces",
+        "Suited Connectors", "Broadway", "Connectors", "Others"
+    )
+    _CAT_ID = {c: i for i, c in enumerate(CATEGORIES)}
+    
     def __init__(self):
+        # 所有亮牌记录 (每次亮牌一条HandRec)，下面的范围数据只保存其在events中的下标
+        self.events = []
         # 存储每个玩家在不同条件下的牌型数据
-        self.player_ranges = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-        # action_tag -> player -> hand_category -> [hands]
-        self.tag_ranges = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-        # action_line -> player -> hand_category -> [hands]
-        self.line_ranges = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-        
+        # (player, hand_category) -> [event index]
+        self.player_ranges = defaultdict(list)
+        # (action_tag, player, hand_category) -> [(event index, stage, action)]
+        self.tag_ranges = defaultdict(list)
+        # (action_line, player, hand_category) -> [event index]
+        self.line_ranges = defaultdict(list)
+        # player -> 每次亮牌的牌型类别id (CATEGORIES下标)，汇总时用np.bincount计数
+        self._player_cat_ids = defaultdict(partial(array, 'B'))
+        
+        # 169种起手牌(含同花/非同花)的分类和标准化表示，只计算一次
+        self._category_table, self._label_table = self._build_hand_tables()
+        self._category_array = np.array(self._category_table, dtype=object)
+        self._label_array = np.array(self._label_table, dtype=object)
+        
+        # 各表格图片复用同一个Figure，避免每张图重新初始化
+        self._fig = None
+    
+    def _build_hand_tables(self) -> Tuple[List[str], List[str]]:
+        """预先计算 (高牌, 低牌, 是否同花) -> 牌型类别/标准化表示 的查找表"""
+        categories = [None] * 338
+        labels = [None] * 338
+        for hi in range(13):
+            for lo in range(hi + 1):
+                for suited in (0, 1):
+                    cards = [_RANK_ORDER[hi] + '♠', _RANK_ORDER[lo] + ('♠' if suited else '♥')]
+                    key = ((hi * 13 + lo) << 1) | suited
+                    categories[key] = self._categorize_cards(cards)
+                    labels[key] = self._normalize_cards(cards)
+        return categories, labels
+    
+    def _hand_key(self, hole_cards: List[str]):
+        """底牌 -> 查找表索引，牌面无法识别时返回None"""
+        card1, card2 = hole_cards
+        i1 = _RANK_INDEX.get(card1[0])
+        i2 = _RANK_INDEX.get(card2[0])
+        if i1 is None or i2 is None:
+            return None
+        if i1 < i2:
+            i1, i2 = i2, i1
+        suit1 = card1[1] if len(card1) > 1 else card1[-1]
+        suit2 = card2[1] if len(card2) > 1 else card2[-1]
+        return ((i1 * 13 + i2) << 1) | (suit1 == suit2)
+    
+    def classify_hands(self, hands: List[List[str]]) -> Tuple[List[str], List[str]]:
+        """批量计算一组两张底牌的 (牌型类别, 标准化表示)，用NumPy一次完成查表"""
+        n = len(hands)
+        if n == 0:
+            return [], []
+        
+        ranks = ''.join(card1[0] + card2[0] for card1, card2 in hands)
+        suits = ''.join((card1[1] if len(card1) > 1 else card1[-1]) +
+                        (card2[1] if len(card2) > 1 else card2[-1])
+                        for card1, card2 in hands)
+        rank_codes = np.frombuffer(ranks.encode('utf-32-le'), dtype=np.uint32).reshape(n, 2)
+        suit_codes = np.frombuffer(suits.encode('utf-32-le'), dtype=np.uint32).reshape(n, 2)
+        
+        keys = _hand_keys(rank_codes, suit_codes)
+        unknown = keys < 0
+        keys[unknown] = 0
+        
+        categories = self._category_array[keys].tolist()
+        labels = self._label_array[keys].tolist()
+        # 含无法识别牌面的手牌按原规则处理
+        for i in np.flatnonzero(unknown).tolist():
+            categories[i] = self._categorize_cards(hands[i])
+            labels[i] = self._normalize_cards(hands[i])
+        return categories, labels
+    
     def categorize_hand(self, hole_cards: List[str]) -> str:
         """将底牌分类到不同的牌型类别"""
         if len(hole_cards) != 2:
             return "Unknown"
         
+        key = self._hand_key(hole_cards)
+        if key is None:
+            return self._categorize_cards(hole_cards)
+        return self._category_table[key]
+    
+    def _categorize_cards(self, hole_cards: List[str]) -> str:
+        """牌型分类规则 (用于生成查找表)"""
         # 解析牌型
         card1, card2 = hole_cards
         rank1 = self.get_rank_value(card1[0])
@@ -100,17 +254,20 @@ class RangeAnalyzer:
     
     def get_rank_value(self, rank: str) -> int:
         """获取牌面大小的数值"""
-        rank_values = {
-            '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, 
-            'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-        }
-        return rank_values.get(rank, 0)
+        return _RANK_VAL.get(rank, 0)
     
     def normalize_hand(self, hole_cards: List[str]) -> str:
         """标准化牌型表示 (如AKo, AKs, 77等)"""
         if len(hole_cards) != 2:
             return "Unknown"
         
+        key = self._hand_key(hole_cards)
+        if key is None:
+            return self._normalize_cards(hole_cards)
+        return self._label_table[key]
+    
+    def _normalize_cards(self, hole_cards: List[str]) -> str:
+        """标准化规则 (用于生成查找表)"""
         card1, card2 = hole_cards
         rank1 = card1[0]
         rank2 = card2[0]
@@ -118,8 +275,7 @@ class RangeAnalyzer:
         suit2 = card2[1] if len(card2) > 1 else card2[-1]
         
         # 标准化rank顺序
-        rank_order = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-        if rank_order.index(rank1) < rank_order.index(rank2):
+        if _RANK_INDEX[rank1] < _RANK_INDEX[rank2]:
             rank1, rank2 = rank2, rank1
         
         if rank1 == rank2:
@@ -132,20 +288,32 @@ class RangeAnalyzer:
     def analyze_enhanced_hands_file(self, enhanced_hands_file: str):
         """分析一个enhanced_hands.json文件中的showdown数据"""
         
-        with open(enhanced_hands_file, 'r', encoding='utf-8') as f:
-            hands = json.load(f)
+        hands = load_enhanced_hands(enhanced_hands_file)
         
         print(f"Analyzing showdown data from: {os.path.basename(enhanced_hands_file)}")
         
         showdown_count = 0
+        # 先收集所有亮牌记录，再批量分类
+        shown = []
         
         for hand in hands:
-            showdown = hand.get('showdown', [])
+            showdown = hand.get('showdown', ())
             if not showdown:
                 continue
                 
             showdown_count += 1
-            action_lines = hand.get('action_lines', {})
+            action_lines = hand.get('action_lines') or {}
+            hand_id = hand.get('hand_id', 'unknown')
+            
+            # 每手牌只遍历一次行动: player -> [(tag, stage, action)]
+            player_tags = defaultdict(list)
+            for stage in ['preflop', 'flop', 'turn', 'river']:
+                for action in hand.get(f'{stage}_actions', ()):
+                    action_player = action.get('player')
+                    for tag_info in action.get('tags', ()):
+                        tag = tag_info.get('tag')
+                        if tag and action_player:
+                            player_tags[action_player].append((sys.intern(tag), stage, action.get('action')))
             
             # 分析每个亮牌的玩家
             for show_info in showdown:
@@ -155,64 +323,85 @@ class RangeAnalyzer:
                 if not player or not hole_cards or len(hole_cards) != 2:
                     continue
                 
-                # 分类牌型
-                hand_category = self.categorize_hand(hole_cards)
-                normalized_hand = self.normalize_hand(hole_cards)
+                # 玩家名/行动线是范围数据的键，驻留后同一文件内共享同一个字符串对象
+                # (多进程分析时跨文件的共享在merge_ranges中完成)
+                player = sys.intern(player)
                 
                 # 获取该玩家的行动线
-                player_action_line = action_lines.get(player, "Unknown")
-                
-                # 存储到范围数据中
-                self.player_ranges[player][hand_category]['hands'].append({
-                    'cards': hole_cards,
-                    'normalized': normalized_hand,
-                    'action_line': player_action_line,
-                    'hand_id': hand.get('hand_id', 'unknown')
-                })
-                
-                # 获取该手牌中玩家的标签行动
-                for stage in ['preflop', 'flop', 'turn', 'river']:
-                    stage_actions = hand.get(f'{stage}_actions', [])
-                    for action in stage_actions:
-                        if action.get('player') == player:
-                            tags = action.get('tags', [])
-                            for tag_info in tags:
-                                tag = tag_info.get('tag')
-                                if tag:
-                                    self.tag_ranges[tag][player][hand_category].append({
-                                        'cards': hole_cards,
-                                        'normalized': normalized_hand,
-                                        'action_line': player_action_line,
-                                        'stage': stage,
-                                        'action': action.get('action'),
-                                        'hand_id': hand.get('hand_id', 'unknown')
-                                    })
-                
-                # 按行动线分类
-                self.line_ranges[player_action_line][player][hand_category].append({
-                    'cards': hole_cards,
-                    'normalized': normalized_hand,
-                    'hand_id': hand.get('hand_id', 'unknown')
-                })
+                player_action_line = action_lines.get(player)
+                if player_action_line is None:
+                    player_action_line = _UNKNOWN
+                else:
+                    player_action_line = sys.intern(player_action_line)
+                shown.append((player, hole_cards, player_action_line, hand_id, player_tags.get(player, ())))
+        
+        # 分类牌型
+        categories, labels = self.classify_hands([rec[1] for rec in shown])
+        
+        events = self.events
+        for (player, hole_cards, player_action_line, hand_id, tagged_actions), hand_category, normalized_hand in zip(
+                shown, categories, labels):
+            packed_cards = _pack_cards(hole_cards)
+            
+            # 存储到范围数据中 (玩家范围、标签和行动线共用同一条记录)
+            event_idx = len(events)
+            events.append(HandRec(packed_cards, normalized_hand, player_action_line, hand_id))
+            self.player_ranges[(player, hand_category)].append(event_idx)
+            self._player_cat_ids[player].append(self._CAT_ID[hand_category])
+            
+            # 该手牌中玩家的标签行动
+            for tag, stage, action_type in tagged_actions:
+                self.tag_ranges[(tag, player, hand_category)].append((event_idx, stage, action_type))
+            
+            # 按行动线分类
+            self.line_ranges[(player_action_line, player, hand_category)].append(event_idx)
         
         print(f"Found {showdown_count} hands with showdown data")
     
+    def export_ranges(self) -> Tuple:
+        """导出范围数据 (用于多进程分析后合并)"""
+        return self.events, self.player_ranges, self.tag_ranges, self.line_ranges, self._player_cat_ids
+    
+    def merge_ranges(self, ranges: Tuple):
+        """合并另一个分析器导出的范围数据，效果等同于依次分析其文件"""
+        events, player_ranges, tag_ranges, line_ranges, player_cat_ids = ranges
+        
+        # 子进程中驻留的字符串经pickle传回后是各文件独立的副本，
+        # 在此重新驻留，使所有文件的键和行动线共享同一个字符串对象
+        intern = sys.intern
+        
+        # 合并进来的记录下标整体后移
+        offset = len(self.events)
+        self.events.extend(HandRec(cards, normalized, intern(action_line), hand_id)
+                           for cards, normalized, action_line, hand_id in events)
+        for (player, category), indexes in player_ranges.items():
+            self.player_ranges[(intern(player), intern(category))].extend(i + offset for i in indexes)
+        for (tag, player, category), refs in tag_ranges.items():
+            self.tag_ranges[(intern(tag), intern(player), intern(category))].extend(
+                (i + offset, stage, action) for i, stage, action in refs)
+        for (action_line, player, category), indexes in line_ranges.items():
+            self.line_ranges[(intern(action_line), intern(player), intern(category))].extend(
+                i + offset for i in indexes)
+        for player, cat_ids in player_cat_ids.items():
+            self._player_cat_ids[intern(player)].extend(cat_ids)
+    
+    def get_action_tags(self) -> List[str]:
+        """有范围数据的行动标签 (按首次出现顺序)"""
+        return list(dict.fromkeys(tag for tag, _, _ in self.tag_ranges))
+    
     def create_player_range_summary(self) -> pd.DataFrame:
         """创建玩家范围总结表"""
         
         data = []
-        categories = [
-            "Premium Pairs", "Medium Pairs", "Small Pairs",
-            "Strong Aces", "Medium Aces", "Weak Aces", 
-            "Suited Connectors", "Broadway", "Connectors", "Others"
-        ]
+        categories = self.CATEGORIES
         
-        for player, ranges in self.player_ranges.items():
+        # 每个玩家一次bincount得到各牌型类别的数量
+        for player, cat_ids in self._player_cat_ids.items():
+            counts = np.bincount(np.frombuffer(cat_ids, dtype=np.uint8), minlength=len(categories)).tolist()
             row = {'Player': player}
             total_hands = 0
             
-            for category in categories:
-                count = len(ranges.get(category, {}).get('hands', []))
+            for category, count in zip(categories, counts):
                 row[category] = count
                 total_hands += count
             
@@ -225,22 +414,23 @@ class RangeAnalyzer:
     def create_tag_range_summary(self, tag: str) -> pd.DataFrame:
         """创建特定标签的范围分析表"""
         
-        if tag not in self.tag_ranges:
+        player_counts = defaultdict(Counter)
+        for (hand_tag, player, category), hands in self.tag_ranges.items():
+            if hand_tag == tag:
+                player_counts[player][category] += len(hands)
+        
+        if not player_counts:
             return pd.DataFrame()
         
         data = []
-        categories = [
-            "Premium Pairs", "Medium Pairs", "Small Pairs",
-            "Strong Aces", "Medium Aces", "Weak Aces", 
-            "Suited Connectors", "Broadway", "Connectors", "Others"
-        ]
+        categories = self.CATEGORIES
         
-        for player, ranges in self.tag_ranges[tag].items():
+        for player, counts in player_counts.items():
             row = {'Player': player}
             total_hands = 0
             
             for category in categories:
-                count = len(ranges.get(category, []))
+                count = counts[category]
                 row[category] = count
                 total_hands += count
             
@@ -253,25 +443,33 @@ class RangeAnalyzer:
             return df.sort_values('Total', ascending=False)
         return df
     
-    def create_range_table_image(self, df: pd.DataFrame, title: str, output_path: str):
-        """创建范围分析表格图片"""
+    def create_range_table_image(self, df: pd.DataFrame, title: str, output):
+        """创建范围分析表格图片 (output为图片路径，或PdfPages以追加一页)"""
         
         if df.empty:
             print(f"No data for {title}")
             return
         
-        # 计算表格尺寸
-        n_rows = len(df)
-        n_cols = len(df.columns)
+        # 一次性取出表格数据，之后只按NumPy下标访问
+        values = df.to_numpy()
+        cols = df.columns.tolist()
+        n_rows, n_cols = values.shape
         
-        # 创建图片
-        fig, ax = plt.subplots(figsize=(max(14, n_cols * 1.0), max(6, n_rows * 0.5)), dpi=300)
+        # 创建图片 (复用已有Figure)
+        figsize = (max(14, n_cols * 1.0), max(6, n_rows * 0.5))
+        if self._fig is None:
+            self._fig = plt.figure(figsize=figsize, dpi=150)
+        else:
+            self._fig.clear()
+            self._fig.set_size_inches(figsize)
+        fig = self._fig
+        ax = fig.add_subplot()
         ax.axis('tight')
         ax.axis('off')
         
         # 创建表格
-        table = ax.table(cellText=df.values,
-                        colLabels=df.columns,
+        table = ax.table(cellText=values.tolist(),
+                        colLabels=cols,
                         cellLoc='center',
                         loc='center',
                         bbox=[0, 0, 1, 1])
@@ -281,74 +479,75 @@ class RangeAnalyzer:
         table.set_fontsize(9)
         table.scale(1, 1.8)
         
-        # 设置表头样式
-        for i in range(n_cols):
-            table[(0, i)].set_facecolor('#8E24AA')  # 紫色
-            table[(0, i)].set_text_props(weight='bold', color='white')
-        
-        # 设置数据单元格样式
-        for i in range(1, n_rows + 1):
-            for j in range(n_cols):
-                cell_value = df.iloc[i-1, j]
-                
+        # 数值列: 根据数量一次算出所有单元格的颜色 (RGBA)
+        counts = values[:, 1:].astype(np.int64)
+        rgba = np.empty(counts.shape + (4,))
+        rgba[..., :3] = (0.9, 0.8, 1.0)
+        rgba[..., 3] = np.clip(counts / 10.0, 0.0, 1.0)
+        colors = rgba.tolist()
+        positive = (counts > 0).tolist()
+        
+        # 单次遍历所有单元格设置样式
+        for (i, j), cell in table.get_celld().items():
+            if i == 0:
+                # 表头
+                cell.set_facecolor('#8E24AA')  # 紫色
+                cell.set_text_props(weight='bold', color='white')
+            elif j == 0:
                 # 玩家名称列
-                if j == 0:
-                    table[(i, j)].set_facecolor('#F3E5F5')  # 浅紫色
-                    table[(i, j)].set_text_props(weight='bold')
-                # 数值列
-                else:
-                    try:
-                        value = int(cell_value)
-                        if value > 0:
-                            # 根据数量设置颜色深度
-                            alpha = min(1.0, value / 10)  # 调整透明度
-                            table[(i, j)].set_facecolor((0.9, 0.8, 1.0, alpha))
-                            table[(i, j)].set_text_props(weight='bold')
-                        else:
-                            table[(i, j)].set_facecolor('#F5F5F5')
-                            table[(i, j)].set_text_props(color='gray')
-                    except:
-                        pass
+                cell.set_facecolor('#F3E5F5')  # 浅紫色
+                cell.set_text_props(weight='bold')
+            elif positive[i - 1][j - 1]:
+                cell.set_facecolor(colors[i - 1][j - 1])
+                cell.set_text_props(weight='bold')
+            else:
+                cell.set_facecolor('#F5F5F5')
+                cell.set_text_props(color='gray')
         
         # 设置标题
         fig.suptitle(title, fontsize=14, fontweight='bold', y=0.95)
         
         # 调整布局
-        plt.tight_layout()
-        plt.subplots_adjust(top=0.9)
-        
-        # 保存图片
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        fig.tight_layout()
+        fig.subplots_adjust(top=0.9)
         
-        print(f"Generated range analysis: {output_path}")
+        # 保存图片 (PdfPages时追加为一页，共用同一个文件句柄)
+        if isinstance(output, PdfPages):
+            output.savefig(fig, bbox_inches='tight', facecolor='white')
+            print(f"Generated range analysis page: {title}")
+        else:
+            fig.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+            print(f"Generated range analysis: {output}")
+    
+    def _iter_tag_records(self, tag: str, player: str = None):
+        """按玩家分组产出 (player, category, HandRec, stage, action)，保持玩家和牌型类别的首次出现顺序"""
+        player_hands = defaultdict(list)
+        for (hand_tag, p, category), hands in self.tag_ranges.items():
+            if hand_tag == tag and (not player or p == player):
+                player_hands[p].append((category, hands))
+        
+        events = self.events
+        for p, category_hands in player_hands.items():
+            for category, hands in category_hands:
+                for event_idx, stage, action in hands:
+                    yield p, category, events[event_idx], stage, action
     
     def get_specific_hands_for_tag(self, tag: str, player: str = None) -> List[Dict]:
         """获取特定标签下的具体牌型数据"""
         
         hands_data = []
         
-        if tag not in self.tag_ranges:
-            return hands_data
-        
-        players_to_check = [player] if player else self.tag_ranges[tag].keys()
-        
-        for p in players_to_check:
-            if p not in self.tag_ranges[tag]:
-                continue
-                
-            for category, hands in self.tag_ranges[tag][p].items():
-                for hand_info in hands:
-                    hands_data.append({
-                        'player': p,
-                        'category': category,
-                        'cards': hand_info['cards'],
-                        'normalized': hand_info['normalized'],
-                        'action_line': hand_info['action_line'],
-                        'stage': hand_info['stage'],
-                        'action': hand_info['action'],
-                        'hand_id': hand_info['hand_id']
-                    })
+        for p, category, hand_info, stage, action in self._iter_tag_records(tag, player):
+            hands_data.append({
+                'player': p,
+                'category': category,
+                'cards': _unpack_cards(hand_info.cards),
+                'normalized': hand_info.normalized,
+                'action_line': hand_info.action_line,
+                'stage': stage,
+                'action': action,
+                'hand_id': hand_info.hand_id
+            })
         
         return hands_data
     
@@ -357,13 +556,21 @@ class RangeAnalyzer:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        # 导出每个标签的详细数据
-        for tag in self.tag_ranges.keys():
-            hands_data = self.get_specific_hands_for_tag(tag)
-            if hands_data:
-                df = pd.DataFrame(hands_data)
+        header = ['player', 'category', 'cards', 'normalized', 'action_line', 'stage', 'action', 'hand_id']
+        
+        # 导出每个标签的详细数据 (直接用csv写出，不经过DataFrame)
+        for tag in self.get_action_tags():
+            rows = [
+                (p, category, _unpack_cards(hand_info.cards), hand_info.normalized, hand_info.action_line,
+                 stage, action, hand_info.hand_id)
+                for p, category, hand_info, stage, action in self._iter_tag_records(tag)
+            ]
+            if rows:
                 csv_file = os.path.join(output_dir, f"range_detail_{tag}.csv")
-                df.to_csv(csv_file, index=False, encoding='utf-8')
+                with open(csv_file, 'w', buffering=1 << 20, newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(header)
+                    writer.writerows(rows)
                 print(f"Exported detailed range data: {csv_file}")
     
     def generate_all_visualizations(self, output_dir: str):
@@ -372,27 +579,34 @@ class RangeAnalyzer:
         print(f"\n🎨 Generating range analysis visualizations...")
         print("-" * 60)
         
-        # 生成玩家总体范围分析
-        player_summary = self.create_player_range_summary()
-        if not player_summary.empty:
-            self.create_range_table_image(
-                player_summary, 
-                "Player Range Analysis - All Showdowns",
-                os.path.join(output_dir, "player_range_summary.png")
-            )
-        
-        # 生成每个标签的范围分析
-        common_tags = ['open', '3bet', 'cbet', 'check-raise', 'donk']
-        
-        for tag in common_tags:
-            if tag in self.tag_ranges:
-                tag_summary = self.create_tag_range_summary(tag)
-                if not tag_summary.empty:
-                    self.create_range_table_image(
-                        tag_summary, 
-                        f"Range Analysis - {tag.upper()} Action",
-                        os.path.join(output_dir, f"range_{tag}.png")
-                    )
+        # 所有表格写入同一个多页PDF
+        with PdfPages(os.path.join(output_dir, "ranges.pdf")) as pdf:
+            # 生成玩家总体范围分析
+            player_summary = self.create_player_range_summary()
+            if not player_summary.empty:
+                self.create_range_table_image(
+                    player_summary, 
+                    "Player Range Analysis - All Showdowns",
+                    pdf
+                )
+            
+            # 生成每个标签的范围分析
+            common_tags = ['open', '3bet', 'cbet', 'check-raise', 'donk']
+            available_tags = self.get_action_tags()
+            
+            for tag in common_tags:
+                if tag in available_tags:
+                    tag_summary = self.create_tag_range_summary(tag)
+                    if not tag_summary.empty:
+                        self.create_range_table_image(
+                            tag_summary, 
+                            f"Range Analysis - {tag.upper()} Action",
+                            pdf
+                        )
+        
+        if self._fig is not None:
+            plt.close(self._fig)
+            self._fig = None
         
         print(f"✅ All range analysis visualizations generated!")
     
@@ -403,17 +617,14 @@ class RangeAnalyzer:
         print("Range Analysis Summary")
         print(f"{'='*80}")
         
-        # 总体统计
-        total_showdowns = sum(
-            len(ranges.get(cat, {}).get('hands', []))
-            for ranges in self.player_ranges.values()
-            for cat in ranges.keys()
-        )
+        # 单次遍历得到每个玩家的亮牌数，总体统计由此推出
+        player_counts = Counter()
+        for (player, _), hands in self.player_ranges.items():
+            player_counts[player] += len(hands)
         
-        total_players_with_showdowns = len([
-            player for player, ranges in self.player_ranges.items()
-            if any(ranges.get(cat, {}).get('hands', []) for cat in ranges.keys())
-        ])
+        # 总体统计
+        total_showdowns = sum(player_counts.values())
+        total_players_with_showdowns = sum(1 for count in player_counts.values() if count)
         
         print(f"\n📊 Overall Statistics:")
         print(f"  - Players with showdown data: {total_players_with_showdowns}")
@@ -421,29 +632,29 @@ class RangeAnalyzer:
         
         # 标签统计
         print(f"\n🏷️ Action Tags with Range Data:")
-        for tag, players in self.tag_ranges.items():
-            sample_count = sum(
-                len(hands) 
-                for player_data in players.values()
-                for hands in player_data.values()
-            )
+        tag_counts = Counter()
+        for (tag, _, _), hands in self.tag_ranges.items():
+            tag_counts[tag] += len(hands)
+        for tag, sample_count in tag_counts.items():
             if sample_count > 0:
                 print(f"  - {tag}: {sample_count} samples")
         
         # 玩家统计
         print(f"\n👥 Players with Most Showdown Data:")
-        player_counts = []
-        for player, ranges in self.player_ranges.items():
-            count = sum(
-                len(ranges.get(cat, {}).get('hands', []))
-                for cat in ranges.keys()
-            )
+        for player, count in player_counts.most_common(5):
             if count > 0:
-                player_counts.append((player, count))
-        
-        player_counts.sort(key=lambda x: x[1], reverse=True)
-        for player, count in player_counts[:5]:
-            print(f"  - {player}: {count} showdown samples")
+                print(f"  - {player}: {count} showdown samples")
+
+def _analyze_file_worker(enhanced_file: str):
+    """在子进程中分析单个文件，返回 (输出文本, 范围数据, 错误信息)"""
+    analyzer = RangeAnalyzer()
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            analyzer.analyze_enhanced_hands_file(enhanced_file)
+    except Exception as e:
+        return output.getvalue(), None, str(e)
+    return output.getvalue(), analyzer.export_ranges(), None
 
 def process_all_enhanced_files(output_dir: str = "range_analysis"):
     """处理所有enhanced_hands.json文件进行范围分析"""
@@ -464,13 +675,24 @@ def process_all_enhanced_files(output_dir: str = "range_analysis"):
     # 创建分析器
     analyzer = RangeAnalyzer()
     
-    # 分析所有文件
-    for enhanced_file in enhanced_files:
-        try:
-            analyzer.analyze_enhanced_hands_file(enhanced_file)
-        except Exception as e:
-            print(f"Error processing file {enhanced_file}: {e}")
-            continue
+    # 分析所有文件: 多个文件时每个文件在独立进程中解析，再按文件顺序合并
+    if len(enhanced_files) > 1:
+        workers = min(len(enhanced_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_analyze_file_worker, enhanced_files)
+            for enhanced_file, (output, ranges, error) in zip(enhanced_files, results):
+                sys.stdout.write(output)
+                if error is not None:
+                    print(f"Error processing file {enhanced_file}: {error}")
+                    continue
+                analyzer.merge_ranges(ranges)
+    else:
+        for enhanced_file in enhanced_files:
+            try:
+                analyzer.analyze_enhanced_hands_file(enhanced_file)
+            except Exception as e:
+                print(f"Error processing file {enhanced_file}: {e}")
+                continue
     
     # 显示摘要
     analyzer.display_summary()
@@ -496,14 +718,15 @@ def main():
         print(f"\n📁 Results exported to: range_analysis/")
         print("Files include:")
         print("📊 Detailed CSV data files:")
-        for tag in analyzer.tag_ranges.keys():
+        available_tags = analyzer.get_action_tags()
+        for tag in available_tags:
             print(f"  - range_detail_{tag}.csv")
-        print("\n🎨 Range Analysis Images:")
-        print("  - player_range_summary.png")
+        print("\n🎨 Range Analysis Images (ranges.pdf):")
+        print("  - Player Range Analysis - All Showdowns")
         common_tags = ['open', '3bet', 'cbet', 'check-raise', 'donk']
         for tag in common_tags:
-            if tag in analyzer.tag_ranges:
-                print(f"  - range_{tag}.png")
+            if tag in available_tags:
+                print(f"  - Range Analysis - {tag.upper()} Action")
         
         print(f"\n💡 Hand Categories:")
         print("  - Premium Pairs: AA, KK, QQ, JJ")